@@ -1,145 +1,535 @@
+import contextlib
+import io
+import math
+import os
 import random
-import time
-import matplotlib.pyplot as plt
 import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Without Numba the kernels below run as plain Python on lists.
+    NUMBA_AVAILABLE = False
 
-# Increase recursion limit to handle deep recursions for larger inputs
-sys.setrecursionlimit(10000)
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 #########################################
 # 1. Quicksort Implementations
 #########################################
 
+# Subranges at or below this size are finished with insertion sort.
+INSERTION_SORT_CUTOFF = 16
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _insertion_sort(a, lo, hi):
+    """
+    Sorts a[lo..hi] (inclusive) in place with straight insertion sort.
+    """
+    for i in range(lo + 1, hi + 1):
+        x = a[i]
+        j = i - 1
+        while j >= lo and a[j] > x:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = x
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _partition(a, lo, hi):
+    """
+    Three-way (Dutch national flag) partition of a[lo..hi] around the pivot
+    a[lo]. Returns (lt, gt) such that a[lo..lt-1] < pivot, a[lt..gt] == pivot
+    and a[gt+1..hi] > pivot, so keys equal to the pivot are never revisited.
+    """
+    pivot = a[lo]
+    lt, i, gt = lo, lo + 1, hi
+    while i <= gt:
+        if a[i] < pivot:
+            a[lt], a[i] = a[i], a[lt]
+            lt += 1
+            i += 1
+        elif a[i] > pivot:
+            a[i], a[gt] = a[gt], a[i]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _median_of_three(a, lo, hi):
+    """
+    Orders a[lo], a[mid] and a[hi], then moves the median of the three into
+    a[lo] so it becomes the pivot for _partition.
+    """
+    mid = (lo + hi) // 2
+    if a[mid] < a[lo]:
+        a[lo], a[mid] = a[mid], a[lo]
+    if a[hi] < a[lo]:
+        a[lo], a[hi] = a[hi], a[lo]
+    if a[hi] < a[mid]:
+        a[mid], a[hi] = a[hi], a[mid]
+    a[lo], a[mid] = a[mid], a[lo]
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _sift_down(a, lo, root, end):
+    """
+    Restores the max-heap property for the heap stored in a[lo..lo+end],
+    starting from the node at offset 'root'.
+    """
+    while True:
+        child = 2 * root + 1
+        if child > end:
+            return
+        if child < end and a[lo + child] < a[lo + child + 1]:
+            child += 1
+        if a[lo + root] < a[lo + child]:
+            a[lo + root], a[lo + child] = a[lo + child], a[lo + root]
+            root = child
+        else:
+            return
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _heapsort(a, lo, hi):
+    """
+    Sorts a[lo..hi] (inclusive) in place with heapsort.
+    """
+    n = hi - lo + 1
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(a, lo, root, n - 1)
+    for end in range(n - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        _sift_down(a, lo, 0, end - 1)
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _choose_pivot(a, lo, hi, randomized):
+    """
+    Moves the pivot for a[lo..hi] into a[lo]: a random element when
+    'randomized' is set, otherwise the median of three.
+    """
+    if randomized:
+        pivot_index = random.randint(lo, hi)
+        a[lo], a[pivot_index] = a[pivot_index], a[lo]
+    else:
+        _median_of_three(a, lo, hi)
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _quicksort_range(a, lo, hi, randomized, depth_limit):
+    """
+    In-place iterative introsort of a[lo..hi].
+    Subranges are kept on an explicit stack: the larger half is pushed and
+    the smaller half is processed next, so the stack never holds more than
+    log2(n) entries. A fixed 64-entry array therefore covers any input size
+    and avoids allocating Python lists inside the compiled loop.
+    Each subrange carries a budget of 'depth_limit' partitioning steps
+    (2*log2(n) at the top level); once it runs out the subrange is finished
+    with heapsort, which bounds the worst case at O(n log n).
+    """
+    if hi <= lo:
+        return
+    stack = np.empty((64, 3), dtype=np.int64)
+    stack[0, 0], stack[0, 1], stack[0, 2] = lo, hi, depth_limit
+    top = 1
+    while top > 0:
+        top -= 1
+        lo, hi, depth = stack[top, 0], stack[top, 1], stack[top, 2]
+        while hi - lo + 1 > INSERTION_SORT_CUTOFF and depth > 0:
+            depth -= 1
+            _choose_pivot(a, lo, hi, randomized)
+            lt, gt = _partition(a, lo, hi)
+            if lt - lo < hi - gt:
+                stack[top, 0], stack[top, 1], stack[top, 2] = gt + 1, hi, depth
+                hi = lt - 1
+            else:
+                stack[top, 0], stack[top, 1], stack[top, 2] = lo, lt - 1, depth
+                lo = gt + 1
+            top += 1
+        if hi - lo + 1 > INSERTION_SORT_CUTOFF:
+            _heapsort(a, lo, hi)
+        else:
+            _insertion_sort(a, lo, hi)
+
+# Subranges smaller than this are never handed to another thread.
+PARALLEL_CUTOFF = 10_000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """
+    Returns the shared thread pool, creating it on first use with one
+    worker per CPU this process may run on. The lock keeps concurrent
+    first callers from each creating a pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_available_cores())
+        return _executor
+
+def _available_cores():
+    """
+    Returns the number of CPUs this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _quicksort_parallel(a, lo, hi, randomized, depth_limit, spawn_levels):
+    """
+    Splits a[lo..hi] into up to 2**spawn_levels disjoint subranges by
+    partitioning on the calling thread, then sorts those subranges
+    concurrently: all but one go to the thread pool and the caller sorts
+    the last itself. The compiled kernels release the GIL, and the
+    subranges are disjoint, so the threads never touch the same elements.
+    Pool tasks never wait on other tasks, so any number of callers can
+    share the pool without deadlocking it.
+    """
+    leaves = []
+    pending = [(lo, hi, depth_limit, spawn_levels)]
+    while pending:
+        lo, hi, depth, levels = pending.pop()
+        if levels == 0 or depth == 0 or hi - lo + 1 < PARALLEL_CUTOFF:
+            leaves.append((lo, hi, depth))
+            continue
+        _choose_pivot(a, lo, hi, randomized)
+        lt, gt = _partition(a, lo, hi)
+        pending.append((lo, lt - 1, depth - 1, levels - 1))
+        pending.append((gt + 1, hi, depth - 1, levels - 1))
+    futures = [
+        _get_executor().submit(_quicksort_range, a, lo, hi, randomized, depth)
+        for lo, hi, depth in leaves[:-1]
+    ]
+    lo, hi, depth = leaves[-1]
+    _quicksort_range(a, lo, hi, randomized, depth)
+    for future in futures:
+        future.result()
+
+# Native 64-bit dtype each accepted dtype kind is cast to before sorting.
+_SORT_DTYPES = {'i': np.int64, 'u': np.uint64, 'f': np.float64}
+
+def _numeric_copy(arr):
+    """
+    Returns a fresh 1-D copy of 'arr' cast to native-byte-order int64,
+    uint64 or float64, or None if 'arr' holds anything else. Narrower and
+    byte-swapped dtypes such as float16 or '>i4' are widened, so the
+    compiled kernels only ever see these three dtypes and values are never
+    truncated. Floats wider than 64 bits (longdouble) would be rounded and
+    are rejected. Copying means the caller's data is never modified.
+    """
+    try:
+        a = np.asarray(arr)
+    except ValueError:  # Ragged nested sequences.
+        return None
+    if a.ndim != 1 or a.dtype.kind not in _SORT_DTYPES or a.dtype.itemsize > 8:
+        return None
+    return np.array(a, dtype=_SORT_DTYPES[a.dtype.kind])
+
+def _quicksort(arr, randomized):
+    """
+    Sorts a copy of 'arr' with the quicksort kernel and returns it as a new
+    list; 'arr' itself is left untouched. Only integer and floating-point
+    input (up to 64 bits) is accepted and is widened to int64, uint64 or
+    float64 first, so both backends give the same result.
+    When Numba is available the copy stays a NumPy array so the whole sort
+    runs as compiled code, and large inputs are split over log2(cores)
+    partitioning levels into up to 'cores' subranges sorted concurrently.
+    """
+    a = _numeric_copy(arr)
+    if a is None:
+        raise TypeError("quicksort only sorts integer or floating-point values")
+    n = len(a)
+    depth_limit = 2 * int(math.log2(n)) if n > 1 else 0
+    if not NUMBA_AVAILABLE:
+        # Plain Python indexing is fastest on a list of Python numbers.
+        a = a.tolist()
+        _quicksort_range(a, 0, n - 1, randomized, depth_limit)
+        return a
+    # floor(log2(cores)) levels give at most one subrange per core.
+    spawn_levels = int(math.log2(_available_cores()))
+    _quicksort_parallel(a, 0, n - 1, randomized, depth_limit, spawn_levels)
+    return a.tolist()
+
+def warmup_kernels():
+    """
+    Compiles (or loads from the on-disk cache) every Numba kernel called
+    from Python, so the first timed sort does not include JIT latency.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    for randomized in (False, True):
+        a = np.arange(2, dtype=np.int64)
+        _choose_pivot(a, 0, 1, randomized)
+        _partition(a, 0, 1)
+        _quicksort_range(a, 0, 1, randomized, 2)
+
 def quicksort_non_random(arr):
     """
-    Standard quicksort using the non-random pivot.
-    The pivot is always chosen as the first element.
+    Standard quicksort using a non-random pivot.
+    The pivot is the median of the first, middle and last elements of the
+    subrange, which keeps sorted and reverse-sorted input balanced. Inputs
+    that still defeat it are handed to heapsort by the introsort depth limit.
     """
-    if len(arr) <= 1:
-        return arr  # Base case: array with 0 or 1 element is already sorted.
-    pivot = arr[0]
-    # Partition into two lists: one with elements less than the pivot and one with the rest.
-    less = [x for x in arr[1:] if x < pivot]
-    greater = [x for x in arr[1:] if x >= pivot]
-    # Recursively sort partitions and combine them with the pivot.
-    return quicksort_non_random(less) + [pivot] + quicksort_non_random(greater)
+    return _quicksort(arr, randomized=False)
 
 def quicksort_random(arr):
     """
     Standard quicksort using a random pivot.
-    A random index is chosen, its element is swapped with the first element,
-    and then the partitioning continues.
-    """
-    if len(arr) <= 1:
-        return arr  # Base case.
-    # Choose a random pivot index and swap the element with the first element.
-    pivot_index = random.randint(0, len(arr) - 1)
-    arr[0], arr[pivot_index] = arr[pivot_index], arr[0]
-    pivot = arr[0]
-    # Partition the remaining elements.
-    less = [x for x in arr[1:] if x < pivot]
-    greater = [x for x in arr[1:] if x >= pivot]
-    # Recursively sort and combine.
-    return quicksort_random(less) + [pivot] + quicksort_random(greater)
+    A random index is chosen and its element is swapped with the first
+    element of the subrange before partitioning.
+    """
+    return _quicksort(arr, randomized=True)
+
+def quicksort_numpy(arr):
+    """
+    Vectorized baseline using NumPy's built-in quicksort.
+    On NumPy >= 2.0 with an AVX2/AVX-512 capable CPU this dispatches to the
+    x86-simd-sort kernels; otherwise it falls back to scalar introsort.
+    Like the other quicksorts it sorts a copy and accepts only integer or
+    floating-point input.
+    """
+    a = _numeric_copy(arr)
+    if a is None:
+        raise TypeError("quicksort only sorts integer or floating-point values")
+    a.sort(kind='quicksort')
+    return a.tolist()
+
+# Largest key range counting_sort will allocate counts for (128 MB of int64).
+COUNTING_SORT_MAX_RANGE = 1 << 24
+
+def counting_sort(arr):
+    """
+    Counting sort for integer input.
+    Counts each key with one np.bincount pass over the offset keys and
+    expands the counts back into sorted order. Runs in O(n + k) for a key
+    range of size k, with no comparisons at all.
+    Raises TypeError for non-integer input and ValueError when the key
+    range exceeds COUNTING_SORT_MAX_RANGE.
+    """
+    a = np.asarray(arr)
+    if a.size == 0:
+        return []
+    if a.ndim != 1 or a.dtype.kind not in 'iu':
+        raise TypeError("counting_sort only sorts integers")
+    # Widen to 64 bits so offsets from the minimum cannot wrap in narrow dtypes.
+    a = a.astype(np.uint64 if a.dtype.kind == 'u' else np.int64, copy=False)
+    lo = a.min()
+    # Measured with Python ints, so keys near the int64 limits cannot overflow.
+    key_range = int(a.max()) - int(lo)
+    if key_range > COUNTING_SORT_MAX_RANGE:
+        raise ValueError(
+            f"key range {key_range} exceeds COUNTING_SORT_MAX_RANGE ({COUNTING_SORT_MAX_RANGE})"
+        )
+    # Within the range limit the offsets fit in intp.
+    counts = np.bincount((a - lo).astype(np.intp))
+    return (np.repeat(np.arange(len(counts), dtype=a.dtype), counts) + lo).tolist()
+
+def sort_integers(arr):
+    """
+    Picks the faster sort for 'arr'.
+    Integer input with a key range of at most n/4 (i.e. many duplicates)
+    goes to counting_sort; anything else uses NumPy's vectorized quicksort,
+    which beats counting sort once the range approaches n and the count
+    array no longer stays in cache.
+    """
+    a = np.asarray(arr)
+    if a.dtype.kind in 'iu' and a.size and int(a.max()) - int(a.min()) <= a.size // 4:
+        return counting_sort(a)
+    return np.sort(a, kind='quicksort').tolist()
 
 #########################################
 # 2. Debug Versions (Show Internal Working)
 #########################################
 
+# Recursion levels at or beyond this depth are sorted but not traced; a
+# marker line shows where the trace was cut.
+DEBUG_MAX_DEPTH = 8
+
+def _quicksort_debug(a, randomized, depth, lines):
+    """
+    First-element/random pivot quicksort on a 1-D array that records
+    each step in 'lines' and returns the sorted array.
+    Partitioning is done with one vectorized comparison into a shared
+    boolean buffer instead of two list comprehensions. Pending partitions
+    are kept on an explicit stack (less on top of greater) so the trace
+    comes out in the same order as the recursive version, without any
+    recursion depth limit. Each partition knows its offset in the output,
+    so its pivot can be written straight into its final slot.
+    """
+    out = np.empty_like(a)
+    mask = np.empty(len(a), dtype=bool)
+    stack = [(a, 0, depth)]
+    while stack:
+        a, offset, depth = stack.pop()
+        trace = depth < DEBUG_MAX_DEPTH
+        indent = '  ' * depth  # Indentation to illustrate recursion depth.
+        if depth == DEBUG_MAX_DEPTH:
+            # Mark where the trace is cut so it does not look finished.
+            lines.append(f"{indent}... deeper levels not traced")
+        if len(a) <= 1:
+            if trace:
+                lines.append(f"{indent}Base case reached: {a.tolist()}")
+            out[offset:offset + len(a)] = a
+            continue
+        if randomized:
+            pivot_index = random.randint(0, len(a) - 1)
+            a[0], a[pivot_index] = a[pivot_index], a[0]
+            if trace:
+                lines.append(f"{indent}Random pivot chosen: {a[0]} from {a.tolist()}")
+        elif trace:
+            lines.append(f"{indent}Non-random pivot: {a[0]} from {a.tolist()}")
+        rest = a[1:]
+        # The buffer can be reused for every partition because less and
+        # greater are copied out of it before the next one is processed.
+        # Comparing against the one-element slice a[:1] keeps an object
+        # pivot such as a tuple from being broadcast as a sequence.
+        is_less = mask[:len(rest)]
+        np.less(rest, a[:1], out=is_less)
+        less = rest[is_less]
+        greater = rest[~is_less]
+        if trace:
+            lines.append(f"{indent}Partitioned into -> less: {less.tolist()}, greater: {greater.tolist()}")
+        out[offset + len(less)] = a[0]
+        stack.append((greater, offset + len(less) + 1, depth + 1))
+        stack.append((less, offset, depth + 1))
+    return out
+
+def _run_quicksort_debug(arr, randomized, depth):
+    """
+    Runs _quicksort_debug on 'arr' and writes the whole trace in one call.
+    Numbers are partitioned in their own dtype; any other comparable values
+    fall back to an object array, where np.less calls Python's '<'.
+    """
+    a = _numeric_copy(arr)
+    if a is None:
+        a = np.empty(len(arr), dtype=object)
+        for i, x in enumerate(arr):
+            a[i] = x
+    lines = []
+    result = _quicksort_debug(a, randomized, depth, lines)
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+    return result.tolist()
+
 def quicksort_non_random_debug(arr, depth=0):
     """
     Debug version of non-random pivot quicksort.
-    Prints the pivot chosen and the partitions at each recursion level.
-    """
-    indent = '  ' * depth  # Indentation to illustrate recursion depth.
-    if len(arr) <= 1:
-        print(indent + f"Base case reached: {arr}")
-        return arr
-    pivot = arr[0]
-    print(indent + f"Non-random pivot: {pivot} from {arr}")
-    less = [x for x in arr[1:] if x < pivot]
-    greater = [x for x in arr[1:] if x >= pivot]
-    print(indent + f"Partitioned into -> less: {less}, greater: {greater}")
-    sorted_less = quicksort_non_random_debug(less, depth + 1)
-    sorted_greater = quicksort_non_random_debug(greater, depth + 1)
-    return sorted_less + [pivot] + sorted_greater
+    Uses the first element as the pivot and prints the pivot chosen and
+    the partitions at each recursion level.
+    """
+    return _run_quicksort_debug(arr, False, depth)
 
 def quicksort_random_debug(arr, depth=0):
     """
     Debug version of random pivot quicksort.
     Prints the randomly chosen pivot and the partitions at each recursion level.
     """
-    indent = '  ' * depth
-    if len(arr) <= 1:
-        print(indent + f"Base case reached: {arr}")
-        return arr
-    pivot_index = random.randint(0, len(arr) - 1)
-    arr[0], arr[pivot_index] = arr[pivot_index], arr[0]
-    pivot = arr[0]
-    print(indent + f"Random pivot chosen: {pivot} from {arr}")
-    less = [x for x in arr[1:] if x < pivot]
-    greater = [x for x in arr[1:] if x >= pivot]
-    print(indent + f"Partitioned into -> less: {less}, greater: {greater}")
-    sorted_less = quicksort_random_debug(less, depth + 1)
-    sorted_greater = quicksort_random_debug(greater, depth + 1)
-    return sorted_less + [pivot] + sorted_greater
+    return _run_quicksort_debug(arr, True, depth)
 
 #########################################
 # 3. Input Generators for Benchmarking
 #########################################
 
+# Shared generator for vectorized random input.
+_rng = np.random.default_rng()
+
 def generate_best_case(arr):
     """
-    Generates an input ordering for the best-case scenario of non-random quicksort.
-    In this case, the pivot (first element) is always the median,
+    Generates an input ordering for the best-case scenario of first-element
+    pivot quicksort. In this case, the pivot (first element) is always the median,
     resulting in balanced partitions.
     """
-    if len(arr) <= 1:
-        return arr
-    mid = len(arr) // 2  # Median index.
-    # Place the median first, then recursively do the same for left and right subarrays.
-    return [arr[mid]] + generate_best_case(arr[:mid]) + generate_best_case(arr[mid+1:])
+    out = []
+    # Pre-order walk over (lo, hi) index ranges: emit the median of each range,
+    # then visit its left and right halves. The right half is pushed first so
+    # the left half is popped next, matching the recursive ordering.
+    stack = [(0, len(arr))]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        mid = (lo + hi) // 2  # Median index.
+        out.append(arr[mid])
+        stack.append((mid + 1, hi))
+        stack.append((lo, mid))
+    return out
 
 def generate_worst_case(n):
     """
-    Generates the worst-case input for non-random quicksort.
-    For a fixed pivot (first element), a sorted array is worst-case.
+    Generates the classic worst-case input for non-random quicksort.
+    For a fixed pivot (first element), a sorted array is worst-case;
+    median-of-three pivoting turns it into a well-balanced input.
     """
     return list(range(n))
 
 def generate_average_case(n):
     """
     Generates an average-case input for quicksort.
-    Returns an array of 'n' random integers from a uniform distribution.
+    Returns a NumPy array of 'n' random integers drawn uniformly from [0, n],
+    filled by a single vectorized generator call.
     """
-    return [random.randint(0, n) for _ in range(n)]
+    return _rng.integers(0, n + 1, size=n, dtype=np.int64)
 
 #########################################
 # 4. Benchmarking Code
 #########################################
 
+def _pin_to_one_core():
+    """
+    Pins the process to a single CPU so repeated runs are comparable.
+    Returns the previous CPU set, or None where affinity is not supported.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, {min(previous)})
+    return previous
+
 def benchmark_quicksort(sort_func, input_generator, sizes, trials=3):
     """
     Benchmarks the provided quicksort function using the given input generator.
+    For each size, timeit's autorange picks a loop count that takes at least
+    0.2 seconds, then 'trials' repeats of that many loops are timed with the
+    nanosecond counter. Every input is converted to a NumPy array once,
+    outside the timed region, so all curves time the same input type;
+    'sort_func' must not modify its input (the sorts here all copy it).
+    timeit keeps garbage collection off while timing.
     
     Parameters:
       - sort_func: The quicksort function to benchmark.
       - input_generator: Function that generates an input array of size 'n'.
       - sizes: List of input sizes.
-      - trials: Number of trials to average the running time.
+      - trials: Number of timed repeats to average the running time.
       
     Returns:
-      - List of average execution times for each input size.
-    """
-    times = []
-    for n in sizes:
-        total_time = 0
-        for _ in range(trials):
-            arr = input_generator(n)
-            start = time.time()
-            sort_func(arr)
-            total_time += time.time() - start
-        times.append(total_time / trials)
+      - List of average execution times (in seconds) for each input size.
+    """
+    warmup_kernels()
+    previous_affinity = _pin_to_one_core()
+    try:
+        times = []
+        for n in sizes:
+            # Generate and convert the input once per size; the sorts copy
+            # it themselves, so every call sees the same unsorted array.
+            base = np.asarray(input_generator(n))
+            stmt = lambda: sort_func(base)
+            # autorange compares elapsed time against 0.2 seconds, so it
+            # calibrates with the default float timer.
+            loops, _ = timeit.Timer(stmt).autorange()
+            totals_ns = timeit.Timer(stmt, timer=time.perf_counter_ns).repeat(
+                repeat=trials, number=loops
+            )
+            times.append(sum(totals_ns) / (trials * loops) / 1e9)
+    finally:
+        if previous_affinity is not None:
+            os.sched_setaffinity(0, previous_affinity)
     return times
 
 #########################################
@@ -148,8 +538,9 @@ def benchmark_quicksort(sort_func, input_generator, sizes, trials=3):
 
 def test_quicksort():
     """
-    Tests both quicksort implementations (non-random and random pivot)
-    against several test cases to verify correctness.
+    Tests the sort implementations (non-random pivot, random pivot, the
+    NumPy baseline and counting sort) against several test cases to verify
+    correctness.
     """
     test_arrays = [
         [],                             # Empty list.
@@ -160,19 +551,121 @@ def test_quicksort():
         [3, 1, 2, 1, 5, 3],             # Contains duplicates.
         [random.randint(0, 100) for _ in range(10)]  # Random list.
     ]
+
+    # Floats keep their values, and the input is never modified.
+    floats = [2.7, 1.2, 0.5, 1.2]
+    for sort_func in (quicksort_non_random, quicksort_random, quicksort_numpy):
+        original = floats.copy()
+        assert sort_func(original) == sorted(floats), "Float quicksort failed!"
+        assert original == floats, "Quicksort modified its input!"
+        ints = np.array([3, 1, 2])
+        sort_func(ints)
+        assert ints.tolist() == [3, 1, 2], "Quicksort modified its input!"
+        # Narrow and byte-swapped dtypes are widened before sorting.
+        for dtype in (np.float16, '>i4', np.uint8):
+            assert sort_func(np.array([3, 1, 2], dtype=dtype)) == [1, 2, 3], f"Quicksort failed on {dtype}!"
+        unsupported = [["b", "a"]]
+        if np.dtype(np.longdouble).itemsize > 8:
+            unsupported.append(np.array([2.5, 1.5], dtype=np.longdouble))
+        for arr in unsupported:
+            try:
+                sort_func(arr)
+            except TypeError:
+                pass
+            else:
+                raise AssertionError("Quicksort accepted unsupported input!")
+
+    # The debug versions sort floats exactly and any other comparable values
+    # as Python objects; their traces are discarded here.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for arr in (floats, ["b", "c", "a"], [(2, 1), (1, 5), (1,)]):
+            expected = sorted(arr)
+            assert quicksort_non_random_debug(arr) == expected, "Non-random debug quicksort failed!"
+            assert quicksort_random_debug(arr) == expected, "Random debug quicksort failed!"
+
+    # Sorted input with a first-element pivot recurses past DEBUG_MAX_DEPTH.
+    trace = io.StringIO()
+    with contextlib.redirect_stdout(trace):
+        assert quicksort_non_random_debug(list(range(20))) == list(range(20)), "Non-random debug quicksort failed!"
+    assert "deeper levels not traced" in trace.getvalue(), "Debug trace was cut off silently!"
     
     for arr in test_arrays:
         expected = sorted(arr)  # Expected result using Python's built-in sorted().
         result_non_random = quicksort_non_random(arr.copy())
         result_random = quicksort_random(arr.copy())
+        result_numpy = quicksort_numpy(arr.copy())
+        result_counting = counting_sort(arr.copy())
         print("Original array:     ", arr)
         print("Expected sorted:    ", expected)
         print("Non-random result:  ", result_non_random)
         print("Random pivot result:", result_random)
+        print("NumPy result:       ", result_numpy)
+        print("Counting result:    ", result_counting)
         print("-" * 50)
         assert result_non_random == expected, "Non-random quicksort failed!"
         assert result_random == expected, "Random pivot quicksort failed!"
+        assert result_numpy == expected, "NumPy quicksort failed!"
+        assert result_counting == expected, "Counting sort failed!"
+        assert sort_integers(arr) == expected, "Integer sort dispatch failed!"
+
+    # sort_integers sends a duplicate-heavy array (range 5 <= n/4) to
+    # counting_sort and a wide-range one to np.sort.
+    n = 3000
+    duplicates = [random.randint(0, 5) for _ in range(n)]
+    wide = [random.randint(0, 10 * n) for _ in range(n)]
+    assert sort_integers(duplicates) == sorted(duplicates), "Integer sort dispatch failed!"
+    assert sort_integers(wide) == sorted(wide), "Integer sort dispatch failed!"
+
+    # counting_sort handles extreme keys but rejects huge ranges and floats.
+    assert counting_sort([2**63 - 1, 2**63 - 3]) == [2**63 - 3, 2**63 - 1], "Counting sort failed!"
+    assert counting_sort([-2**63 + 2, -2**63]) == [-2**63, -2**63 + 2], "Counting sort failed!"
+    assert counting_sort(np.array([3, 1, 2], dtype=np.uint64)) == [1, 2, 3], "Counting sort failed!"
+    assert counting_sort(np.array([127, -128], dtype=np.int8)) == [-128, 127], "Counting sort failed!"
+    for bad_input, error in (([-2**62, 2**62], ValueError), ([0, 10**12], ValueError),
+                             ([2.7, 1.2], TypeError)):
+        try:
+            counting_sort(bad_input)
+        except error:
+            pass
+        else:
+            raise AssertionError("Counting sort accepted unsupported input!")
     
+    # Arrays well above INSERTION_SORT_CUTOFF, so partitioning, the
+    # median-of-three pivot and the heapsort fallback are all exercised.
+    n = 3000
+    large_arrays = [
+        list(range(n)),                             # Sorted.
+        list(range(n, 0, -1)),                      # Reverse sorted.
+        [random.randint(0, 5) for _ in range(n)],   # Duplicate-heavy.
+        [random.randint(0, n) for _ in range(n)],   # Random.
+    ]
+    for arr in large_arrays:
+        expected = sorted(arr)
+        assert quicksort_non_random(arr) == expected, "Non-random quicksort failed on a large array!"
+        assert quicksort_random(arr) == expected, "Random pivot quicksort failed on a large array!"
+        # A zero depth budget hands the whole range straight to heapsort.
+        a = np.array(arr) if NUMBA_AVAILABLE else list(arr)
+        _quicksort_range(a, 0, n - 1, False, 0)
+        assert list(a) == expected, "Heapsort fallback failed!"
+
+    # Force the threaded path, which the benchmark never reaches: split a
+    # 40k-element array over two levels, from several callers at once so
+    # they share the thread pool.
+    n = 4 * PARALLEL_CUTOFF
+    arrays = [np.array([random.randint(0, n) for _ in range(n)]) for _ in range(4)]
+    expected = [sorted(arr.tolist()) for arr in arrays]
+    with ThreadPoolExecutor(max_workers=len(arrays)) as callers:
+        calls = [
+            callers.submit(
+                _quicksort_parallel, arr, 0, n - 1, randomized, 2 * int(math.log2(n)), 2
+            )
+            for arr, randomized in zip(arrays, (False, True, False, True))
+        ]
+        for call in calls:
+            call.result()
+    for arr, exp in zip(arrays, expected):
+        assert arr.tolist() == exp, "Parallel quicksort failed!"
+
     print("All quicksort tests passed!")
 
 #########################################
@@ -180,6 +673,12 @@ def test_quicksort():
 #########################################
 
 if __name__ == '__main__':
+    # Imported here so importing this module does not pay for matplotlib;
+    # the Agg backend renders to file without a GUI event loop.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
     # Run test cases for both quicksort implementations.
     print("----- Running Quicksort Test Cases -----")
     test_quicksort()
@@ -197,23 +696,25 @@ if __name__ == '__main__':
     # Define input sizes for benchmarking the non-random quicksort.
     sizes = [100, 200, 500, 1000, 2000, 5000]
     
-    # Benchmark non-random quicksort on:
-    # a) Best-case input: Balanced partitions using generate_best_case.
-    times_best = benchmark_quicksort(
+    # Benchmark non-random (median-of-three) quicksort on:
+    # a) Pre-ordered input: each range's median first (generate_best_case),
+    #    the best case for a first-element pivot.
+    times_preordered = benchmark_quicksort(
         quicksort_non_random,
         lambda n: generate_best_case(list(range(n))),
         sizes
     )
     
-    # b) Worst-case input: Already sorted array.
-    times_worst = benchmark_quicksort(
+    # b) Sorted input: the worst case for a first-element pivot, but
+    #    balanced under median-of-three.
+    times_sorted = benchmark_quicksort(
         quicksort_non_random,
         generate_worst_case,
         sizes
     )
     
-    # c) Average-case input: Random array.
-    times_avg = benchmark_quicksort(
+    # c) Random input.
+    times_random = benchmark_quicksort(
         quicksort_non_random,
         generate_average_case,
         sizes
@@ -221,12 +722,14 @@ if __name__ == '__main__':
     
     # Plot the benchmark results for non-random quicksort.
     plt.figure(figsize=(10, 6))
-    plt.plot(sizes, times_best, label="Best Case", marker='o')
-    plt.plot(sizes, times_worst, label="Worst Case", marker='o')
-    plt.plot(sizes, times_avg, label="Average Case", marker='o')
+    plt.plot(sizes, times_preordered, label="Pre-ordered (median first)", marker='o')
+    plt.plot(sizes, times_sorted, label="Sorted", marker='o')
+    plt.plot(sizes, times_random, label="Random", marker='o')
     plt.xlabel("Input Size (n)")
     plt.ylabel("Time (seconds)")
-    plt.title("Benchmark of Non-Random Pivot Quicksort")
+    plt.title("Benchmark of Non-Random (Median-of-Three) Pivot Quicksort")
     plt.legend()
     plt.grid(True)
-    plt.show()
+    plt.savefig('quicksort_benchmark.png', dpi=100)
+    plt.close()
+    print("\nBenchmark plot saved to quicksort_benchmark.png")